@@ -0,0 +1,277 @@
+"""
+공통 명령줄 인터페이스
+인자 파싱, 분석 실행, 요약 출력, CSV/Excel 저장을 스크립트들이 공유합니다.
+"""
+
+import argparse
+import csv
+from typing import Callable, List, Sequence, Tuple
+
+import fitz  # PyMuPDF
+import numpy as np
+import pandas as pd
+
+from extractors import ColumnBBoxStrategy, ExtractionStrategy, PageData, TARGET_CANDIDATES
+from ocr_cache import OcrCache
+from ocr_engine import (BACKENDS, DEFAULT_SCALE, DTYPES, OCR_CONFIG, RUNNERS, TESS_THREADS,
+                        OcrOptions, analyze_pdf)
+
+DEFAULT_PDF = '/home/user/K21elec/jeju.pdf'
+
+
+def build_parser(description: str, output: str, runner: str,
+                 epilog: str = None) -> argparse.ArgumentParser:
+    """공통 인자를 갖춘 파서 (스크립트별 기본 출력 파일/실행 방식)"""
+    parser = argparse.ArgumentParser(
+        description=description,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=epilog
+    )
+    parser.add_argument('pdf', nargs='?', default=DEFAULT_PDF,
+                        help='분석할 PDF 파일 경로')
+    parser.add_argument('--start', type=int, default=0,
+                        help='시작 페이지 (0부터, 기본: 0)')
+    parser.add_argument('--end', type=int, default=None,
+                        help='끝 페이지 (기본: 전체)')
+    parser.add_argument('--output', '-o', default=output,
+                        help=f'출력 파일명 (기본: {output})')
+    parser.add_argument('--candidates', '-c', nargs='+', default=None,
+                        help='분석할 후보자 (기본: 전체 5명)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='상세 출력 (OCR 텍스트 표시)')
+    parser.add_argument('--sample', '-s', type=int, default=None,
+                        help='샘플 페이지 수 (테스트용)')
+    parser.add_argument('--ocr-concurrency', type=int, default=None,
+                        help='동시 OCR 워커 수 (기본: CPU 코어 수 / --tess-threads)')
+    parser.add_argument('--tess-threads', type=int, default=TESS_THREADS,
+                        help=f'Tesseract 프로세스당 스레드 수 (OMP_THREAD_LIMIT, 기본: {TESS_THREADS})')
+    parser.add_argument('--runner', choices=RUNNERS, default=runner,
+                        help=f'OCR 실행 방식 (기본: {runner}; batch: Tesseract 단일 호출, '
+                             'pipeline: 렌더링/OCR/파싱 스레드 파이프라인, '
+                             'async: aiopytesseract, process: 프로세스 풀)')
+    parser.add_argument('--layout', action='store_true',
+                        help='Tesseract TSV 단어 좌표로 열 위치 기반 추출')
+    parser.add_argument('--backend', choices=BACKENDS, default='tesseract',
+                        help='OCR 엔진 (기본: tesseract; paddle: PaddleOCR GPU, '
+                             'doctr: docTR GPU (--doctr-reco 필요), '
+                             'GPU 엔진은 배치 실행 + 열 좌표 기반 추출)')
+    parser.add_argument('--doctr-reco', default=None, metavar='HUB_ID',
+                        help='docTR 한글 인식 모델 (Hugging Face Hub ID; 기본 사전학습 모델은 '
+                             '한글 어휘가 없어 후보자명을 읽지 못함)')
+    parser.add_argument('--dtype', choices=DTYPES, default='auto',
+                        help='GPU OCR 추론 정밀도 (기본: auto = bf16 지원 GPU면 bf16; '
+                             'docTR만 적용, fp8은 bf16으로 대체)')
+    parser.add_argument('--scale', type=float, default=DEFAULT_SCALE,
+                        help='렌더링 배율 (기본: 2.0, 글자가 작은 개표상황표만 2.5 권장; '
+                             '후보자 인식이 부족한 페이지는 3.0으로 자동 재시도)')
+    parser.add_argument('--force-ocr', action='store_true',
+                        help='PDF 텍스트 레이어가 있어도 항상 OCR 실행 (텍스트 레이어 검증용)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='OCR 결과 캐시(.ocr_cache) 사용 안 함')
+    return parser
+
+
+# CSV 헤더와 PageData → 행 변환 함수
+CsvFormat = Tuple[List[str], Callable[[PageData], list]]
+
+
+def csv_format(candidates: Sequence[str]) -> CsvFormat:
+    """to_dataframe()과 같은 열 구성의 CSV 형식"""
+    selected = [c for c in TARGET_CANDIDATES if c in candidates]
+    header = ['페이지', '투표구', '유형', '유효투표', '무효투표', '총계']
+    for name in selected:
+        header += [f'{name}_분류', f'{name}_재확인', f'{name}_계']
+
+    def row(d: PageData) -> list:
+        values = [d.page_num, d.district, d.voting_type,
+                  d.valid_votes, d.invalid_votes, d.total_votes]
+        for c in d.candidates:
+            if c.name in selected:
+                values += [c.classified, c.reconfirm, c.total]
+        return values
+
+    return header, row
+
+
+class CsvRowWriter:
+    """페이지 결과가 나올 때마다 CSV에 한 줄씩 기록
+
+    중단(Ctrl+C)되어도 그때까지 처리한 페이지는 파일에 남는다.
+    행은 처리가 끝난 순서대로 기록된다.
+    """
+
+    def __init__(self, path: str, csv_fmt: CsvFormat):
+        header, self.row = csv_fmt
+        self.file = open(path, 'w', newline='', encoding='utf-8-sig')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(header)
+        self.file.flush()
+
+    def __call__(self, data: PageData):
+        self.writer.writerow(self.row(data))
+        self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.file.close()
+
+
+def analyze(args: argparse.Namespace, strategy: ExtractionStrategy,
+            config: str = OCR_CONFIG, preprocess=None,
+            csv_fmt: CsvFormat = None) -> List[PageData]:
+    """파싱된 인자로 PDF 분석 (--layout 또는 GPU 백엔드면 후보자 행을 좌표 기반으로 추출)
+
+    결과는 페이지가 끝나는 대로 args.output에 스트리밍 기록된다.
+    """
+    if args.backend == 'doctr' and not args.doctr_reco:
+        raise SystemExit("❌ docTR 기본 인식 모델은 한글을 읽지 못함: "
+                         "--doctr-reco로 한글 인식 모델을 지정하세요")
+
+    if (args.layout or args.backend != 'tesseract') and not strategy.layout:
+        # 투표구/유형/총계는 스크립트 전략 그대로, 후보자 행만 열 위치로
+        strategy = ColumnBBoxStrategy(strategy.verbose, strategy)
+
+    doc = fitz.open(args.pdf)
+    total = len(doc)
+    doc.close()
+
+    end = args.end if args.end is not None else total
+    if args.sample:
+        end = args.start + args.sample
+    pages = range(args.start, min(end, total))
+
+    print(f"📄 PDF 분석: {args.pdf}")
+    print(f"📝 총 {total} 페이지 중 {args.start + 1}~{pages.stop} 페이지 분석 "
+          f"({type(strategy).__name__})")
+
+    options = OcrOptions(
+        config=config,
+        preprocess=preprocess,
+        scale=args.scale,
+        text_layer=not args.force_ocr,
+        cache=None if args.no_cache else OcrCache(),
+        backend=args.backend,
+        dtype=args.dtype,
+        threads=max(1, args.tess_threads),
+        reco_model=args.doctr_reco,
+    )
+
+    print(f"📝 완료되는 페이지부터 기록: {args.output}")
+    csv_fmt = csv_fmt or csv_format(args.candidates or TARGET_CANDIDATES)
+    with CsvRowWriter(args.output, csv_fmt) as stream:
+        return analyze_pdf(args.pdf, pages, strategy, options, args.runner,
+                           args.ocr_concurrency, on_page=stream)
+
+
+def _put(columns: dict, name: str, i: int, value):
+    """열 배열에 값 기록 (int64 범위를 넘는 OCR 오인식 숫자면 그 열만 object로 전환)"""
+    try:
+        columns[name][i] = value
+    except OverflowError:
+        columns[name] = columns[name].astype(object)
+        columns[name][i] = value
+
+
+def to_dataframe(results: List[PageData], candidates: List[str] = None) -> pd.DataFrame:
+    """결과를 DataFrame으로 변환"""
+    candidates = candidates or TARGET_CANDIDATES
+
+    # 행마다 dict를 만들지 않고 열 배열을 미리 할당해 채움 (dtype 추론 생략)
+    n = len(results)
+    columns = {
+        '페이지': np.zeros(n, dtype=np.int64),
+        '투표구': np.empty(n, dtype=object),
+        '유형': np.empty(n, dtype=object),
+        '유효투표': np.zeros(n, dtype=np.int64),
+        '무효투표': np.zeros(n, dtype=np.int64),
+        '총계': np.zeros(n, dtype=np.int64),
+    }
+    # 후보자 열은 결과에 등장하는 순서대로
+    names = [c.name for c in results[0].candidates if c.name in candidates] if results else []
+    for name in names:
+        for suffix in ('분류', '재확인', '계'):
+            columns[f'{name}_{suffix}'] = np.zeros(n, dtype=np.int64)
+
+    for i, d in enumerate(results):
+        columns['페이지'][i] = d.page_num
+        columns['투표구'][i] = d.district
+        columns['유형'][i] = d.voting_type
+        _put(columns, '유효투표', i, d.valid_votes)
+        _put(columns, '무효투표', i, d.invalid_votes)
+        _put(columns, '총계', i, d.total_votes)
+        for c in d.candidates:
+            if c.name in candidates:
+                _put(columns, f'{c.name}_분류', i, c.classified)
+                _put(columns, f'{c.name}_재확인', i, c.reconfirm)
+                _put(columns, f'{c.name}_계', i, c.total)
+
+    return pd.DataFrame(columns)
+
+
+def print_summary(df: pd.DataFrame, candidates: List[str] = None):
+    """요약 출력"""
+    candidates = candidates or TARGET_CANDIDATES
+
+    print("\n" + "=" * 70)
+    print("📊 21대 대선 개표 감사 결과 요약 (심사·집계부)")
+    print("=" * 70)
+
+    print(f"\n📌 총 분석 페이지: {len(df)}")
+    print(f"📌 총 유효투표: {df['유효투표'].sum():,}")
+    print(f"📌 총 무효투표: {df['무효투표'].sum():,}")
+    print(f"📌 총 투표수: {df['총계'].sum():,}")
+
+    print("\n" + "-" * 70)
+    print("🗳️  후보자별 득표 현황")
+    print("-" * 70)
+    print(f"{'후보자':<12} {'분류된 투표지':>18} {'재확인대상':>15} {'총계':>15} {'재확인율':>10}")
+    print("-" * 70)
+
+    for c in candidates:
+        if f'{c}_계' in df.columns:
+            classified = df[f'{c}_분류'].sum()
+            reconfirm = df[f'{c}_재확인'].sum()
+            total = df[f'{c}_계'].sum()
+            rate = (reconfirm / total * 100) if total > 0 else 0
+            print(f"{c:<12} {classified:>18,} {reconfirm:>15,} {total:>15,} {rate:>9.2f}%")
+
+    print("-" * 70)
+
+    # 유형별 요약
+    print("\n📈 투표 유형별 현황")
+    print("-" * 70)
+    type_summary = df.groupby('유형').agg({
+        '유효투표': 'sum',
+        '무효투표': 'sum',
+        '총계': 'sum'
+    }).reset_index()
+    for _, row in type_summary.iterrows():
+        print(f"  {row['유형']:<15}: 유효 {row['유효투표']:>10,}  무효 {row['무효투표']:>8,}  총계 {row['총계']:>10,}")
+
+
+def export_csv(df: pd.DataFrame, output_path: str):
+    """CSV로 내보내기 (스트리밍 기록을 페이지 순서로 정렬된 최종본으로 교체)"""
+    df.to_csv(output_path, index=False, encoding='utf-8-sig')
+    print(f"\n💾 CSV 저장: {output_path}")
+
+
+def export_excel(df: pd.DataFrame, output_path: str):
+    """Excel로 내보내기"""
+    try:
+        df.to_excel(output_path, index=False, engine='openpyxl')
+        print(f"💾 Excel 저장: {output_path}")
+    except Exception as e:
+        print(f"⚠️  Excel 저장 실패: {e}")
+
+
+def report(results: List[PageData], args: argparse.Namespace, excel: bool = True):
+    """요약 출력 후 CSV (및 Excel) 저장"""
+    candidates = args.candidates or TARGET_CANDIDATES
+
+    df = to_dataframe(results, candidates)
+    print_summary(df, candidates)
+    export_csv(df, args.output)
+    if excel:
+        export_excel(df, args.output.replace('.csv', '.xlsx'))
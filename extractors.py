@@ -0,0 +1,682 @@
+"""
+개표상황표 OCR 텍스트 추출 전략
+OCR 텍스트(또는 단어 좌표)를 PageData로 바꾸는 방식을 전략 객체로 제공합니다.
+
+- SortedNumbersStrategy: 후보자 라인의 숫자를 크기순으로 분류/재확인/계에 배정
+- CandidateLineStrategy: 후보자명 뒤 숫자만 사용하고 합계 검증으로 조합 선택
+- ColumnBBoxStrategy: 다른 전략을 감싸고 후보자 행만 TSV 단어 좌표의 열 위치로 추출
+- WindowRegexStrategy: 전체 텍스트에서 후보자명 이후 숫자 3개를 정규식으로 추출
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import ahocorasick  # 선택: 후보자명 다중 패턴 검색
+except ImportError:
+    ahocorasick = None
+
+try:
+    import numba  # 선택: 숫자 조합 검증 루프 JIT 컴파일
+except ImportError:
+    numba = None
+
+# 대상 후보자
+TARGET_CANDIDATES = ["이재명", "김문수", "이준석", "권영국", "송진호"]
+
+# 후보자 이름 변형 (OCR 오류 대응)
+CANDIDATE_ALIASES = {
+    "이재명": ["이재명", "재명", "이재"],
+    "김문수": ["김문수", "문수", "김문"],
+    "이준석": ["이준석", "준석", "이준"],
+    "권영국": ["권영국", "영국", "권영"],
+    "송진호": ["송진호", "진호", "송진"],
+}
+
+# 사전 컴파일된 정규식 (페이지마다 반복 호출되는 핫 루프용)
+_NUM_RE = re.compile(r'[\d,\.]+')
+_LINE_NUM_RE = re.compile(r'[\d,]+')
+_NUMBER_RE = re.compile(r'\d[\d,\.]*\d|\d')
+_CLEAN_RE = re.compile(r'[^\d]')
+# 숫자 토큰 정리용 변환표 (정규식 치환보다 빠름)
+_DIGITS_ONLY = str.maketrans('', '', ',.\t ')
+_BRACKET_RE = re.compile(r'[\[\]|]')
+_DISTRICT_RES = [re.compile(p) for p in (
+    r'대통령선거\s*(\S+읍)',
+    r'대통령선거\s*(\S+면)',
+    r'대통령선거\s*(\S+동)',
+)]
+# 후보자명 이후의 숫자 3개까지
+_CANDIDATE_RES = {
+    c: re.compile(rf'{re.escape(c)}[^\d]*(\d[\d,\.]*)[^\d]*(\d[\d,\.]*)?[^\d]*(\d[\d,\.]*)?', re.DOTALL)
+    for c in TARGET_CANDIDATES
+}
+_TOTAL_RE = re.compile(r'계[^\d]*(\d[\d,\.]*)[^\d]*(\d[\d,\.]*)[^\d]*(\d[\d,\.]*)')
+_INVALID_RE = re.compile(r'무효[^\d]*(\d+)')
+
+
+def _build_candidate_automaton(names: List[str]):
+    """후보자명 Aho-Corasick 오토마톤 생성 (pyahocorasick 미설치 시 None)"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for name in names:
+        automaton.add_word(name, name)
+    automaton.make_automaton()
+    return automaton
+
+
+_CANDIDATE_AC = _build_candidate_automaton(TARGET_CANDIDATES)
+
+
+@dataclass
+class CandidateVote:
+    name: str
+    classified: int = 0  # 분류된 투표지
+    reconfirm: int = 0   # 재확인대상 투표지
+    total: int = 0       # 계
+
+
+@dataclass
+class PageData:
+    page_num: int
+    district: str = ""
+    voting_type: str = ""
+    candidates: List[CandidateVote] = field(default_factory=list)
+    valid_votes: int = 0
+    invalid_votes: int = 0
+    total_votes: int = 0
+
+
+def recognized_candidates(data: PageData) -> int:
+    """득표가 인식된 후보자 수"""
+    return sum(1 for c in data.candidates if c.total > 0)
+
+
+def clean_number(text: str) -> int:
+    """숫자 문자열에서 숫자만 추출"""
+    if not text:
+        return 0
+    # 콤마, 점, 공백 등 제거
+    cleaned = _CLEAN_RE.sub('', str(text))
+    return int(cleaned) if cleaned else 0
+
+
+def extract_numbers(line: str) -> List[int]:
+    """라인에서 0보다 큰 숫자 목록 추출"""
+    # [\d,]+ 토큰은 콤마만 지우면 되므로 토큰마다 정규식을 돌리지 않음
+    numbers = [int(n.translate(_DIGITS_ONLY)) for n in _LINE_NUM_RE.findall(line) if n.strip(',. ')]
+    return [n for n in numbers if n > 0]
+
+
+def extract_all_numbers(text: str) -> List[int]:
+    """텍스트에서 모든 숫자 추출 (3자리 이상만)"""
+    # 숫자 패턴: 콤마/마침표 포함 가능 (토큰은 항상 숫자로 시작/끝남)
+    numbers = [int(n.translate(_DIGITS_ONLY)) for n in _NUMBER_RE.findall(text)]
+    return [n for n in numbers if n >= 1]  # 최소 1 이상
+
+
+def find_numbers_after_text(text: str, search_term: str, count: int = 3) -> List[int]:
+    """텍스트 뒤에 나오는 숫자들을 찾음"""
+    # 검색어 위치 찾기 (대소문자 무시)
+    # lower()로 길이가 바뀌지 않으면(대부분) 위치가 원문과 같으므로 정규식 대신 str.find
+    text_lower = text.lower()
+    term_lower = search_term.lower()
+    if len(text_lower) == len(text) and len(term_lower) == len(search_term):
+        idx = text_lower.find(term_lower)
+        end = idx + len(search_term)
+    else:
+        match = re.search(re.escape(search_term), text, re.IGNORECASE)
+        idx, end = (match.start(), match.end()) if match else (-1, -1)
+    if idx < 0:
+        return [0] * count
+
+    # 검색어 이후의 텍스트에서 숫자 추출
+    after_text = text[end:end + 200]
+
+    # 숫자 패턴: 연속된 숫자(콤마 포함)
+    numbers = _NUM_RE.findall(after_text)
+    result = []
+    for num in numbers[:count]:
+        digits = num.translate(_DIGITS_ONLY)
+        result.append(int(digits) if digits else 0)
+
+    # 부족한 경우 0으로 채움
+    while len(result) < count:
+        result.append(0)
+
+    return result
+
+
+def find_candidate_lines(lines: List[str]) -> Dict[str, List[int]]:
+    """한 번의 스캔으로 후보자별 등장 라인 번호 수집"""
+    line_hits = defaultdict(list)
+    for i, line in enumerate(lines):
+        if _CANDIDATE_AC is not None:
+            names = {name for _, name in _CANDIDATE_AC.iter(line)}
+        else:
+            names = [name for name in TARGET_CANDIDATES if name in line]
+        for name in names:
+            line_hits[name].append(i)
+    return line_hits
+
+
+def find_candidates(text: str) -> Dict[str, int]:
+    """한 번의 스캔으로 후보자별 첫 등장 위치 찾기"""
+    first = {}
+    if _CANDIDATE_AC is None:
+        for name in TARGET_CANDIDATES:
+            pos = text.find(name)
+            if pos >= 0:
+                first[name] = pos
+        return first
+    for end, name in _CANDIDATE_AC.iter(text):
+        first.setdefault(name, end - len(name) + 1)
+    return first
+
+
+def search_district(text: str, patterns=_DISTRICT_RES) -> str:
+    """투표구명 추출 (없으면 빈 문자열)"""
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            # 불필요한 문자 제거
+            return _BRACKET_RE.sub('', match.group(1).strip())
+    return ""
+
+
+def print_page_text(text: str, page_num: int, limit: int):
+    """상세 모드: 페이지 OCR 텍스트 출력"""
+    print(f"\n{'='*60}")
+    print(f"Page {page_num + 1} OCR result:")
+    print(text[:limit])
+    print("...")
+
+
+class ExtractionStrategy:
+    """OCR 텍스트 → PageData 변환 전략
+
+    프로세스 풀 워커로 pickle되어 전달되므로 상태는 생성자 인자만 둔다.
+    """
+
+    # True면 OCR 단계에서 단어 좌표(TSV)도 함께 받는다
+    layout = False
+
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
+
+    def parse(self, text: str, page_num: int,
+              words: Optional[pd.DataFrame] = None) -> PageData:
+        raise NotImplementedError
+
+
+# ---------------------------------------------------------------------------
+# SortedNumbersStrategy (analyze_election.py)
+# ---------------------------------------------------------------------------
+
+_SORTED_DISTRICT_RES = _DISTRICT_RES + [re.compile(r'제21대\s*대통령선거\s*(\S+)')]
+
+# 투표유형 키워드 (앞에 있을수록 우선)
+_VOTING_TYPE_KEYWORDS = {
+    '관내사전': ['관내사전', '[관내사전'],
+    '선거일': ['선거일', '[선거일'],
+    '관외사전': ['관외사전', '[관외사전'],
+    '재외투표': ['재외', '재외투표'],
+    '거소/선상': ['거소', '선상'],
+}
+
+
+def extract_district_and_type(text: str) -> Tuple[str, str]:
+    """투표구명과 투표유형 추출"""
+    district = search_district(text, _SORTED_DISTRICT_RES)
+
+    for vtype, keywords in _VOTING_TYPE_KEYWORDS.items():
+        if any(keyword in text for keyword in keywords):
+            return district, vtype
+
+    return district, ""
+
+
+def extract_candidate_votes_improved(text: str) -> List[CandidateVote]:
+    """향상된 후보자별 득표 추출"""
+    candidates = []
+    lines = text.split('\n')
+    line_hits = find_candidate_lines(lines)
+
+    for target in TARGET_CANDIDATES:
+        classified = 0
+        reconfirm = 0
+        total = 0
+
+        # 해당 후보자를 포함하는 첫 라인
+        hits = line_hits.get(target)
+        if hits:
+            # 같은 라인에서 숫자 추출
+            numbers = extract_numbers(lines[hits[0]])
+
+            if len(numbers) >= 3:
+                # 첫 번째 큰 숫자가 분류된 투표지
+                # 가장 작은 숫자가 재확인
+                # 가장 큰 숫자가 총계
+                sorted_nums = sorted(numbers, reverse=True)
+                total = sorted_nums[0] if sorted_nums else 0
+                classified = sorted_nums[1] if len(sorted_nums) > 1 else 0
+                reconfirm = sorted_nums[-1] if len(sorted_nums) > 2 else 0
+
+                # 논리적 검증: total = classified + reconfirm
+                if classified + reconfirm != total and len(numbers) >= 3:
+                    # 다른 조합 시도 (합계 존재 여부는 집합으로 O(1) 확인)
+                    # 조합이 맞는 마지막 j가 최종값이므로 뒤에서부터 찾고 첫 조합에서 종료
+                    num_set = frozenset(numbers)
+                    for j in reversed(range(len(numbers))):
+                        a = numbers[j]
+                        b = next((b for k, b in enumerate(numbers)
+                                  if k != j and a + b in num_set), None)
+                        if b is not None:
+                            classified = a
+                            reconfirm = b
+                            total = a + b
+                            break
+            elif len(numbers) == 2:
+                classified = numbers[0]
+                reconfirm = numbers[1]
+                total = classified + reconfirm
+            elif len(numbers) == 1:
+                total = numbers[0]
+                classified = total
+
+        candidates.append(CandidateVote(
+            name=target,
+            classified=classified,
+            reconfirm=reconfirm,
+            total=total
+        ))
+
+    return candidates
+
+
+def extract_totals_improved(text: str) -> Tuple[int, int, int]:
+    """향상된 유효투표, 무효투표, 총계 추출"""
+    valid_votes = 0
+    invalid_votes = 0
+    total_votes = 0
+
+    lines = text.split('\n')
+
+    for line in lines:
+        # "계" 행 찾기 (후보자별 합계)
+        if line.strip().startswith('계') or '계\t' in line or '계 ' in line[:10]:
+            numbers = extract_numbers(line)
+            if len(numbers) >= 2:
+                # 가장 큰 숫자가 총계
+                sorted_nums = sorted(numbers, reverse=True)
+                total_votes = sorted_nums[0]
+                valid_votes = sorted_nums[1] if len(sorted_nums) > 1 else sorted_nums[0]
+
+        # 무효투표수 찾기
+        if '무효' in line:
+            numbers = extract_numbers(line)
+            if numbers:
+                invalid_votes = min(numbers)  # 무효는 보통 작은 수
+
+    # 투표수 총계 (투표용지 교부수)
+    if total_votes == 0:
+        for line in lines:
+            if '투표수' in line and '교부' not in line:
+                numbers = extract_numbers(line)
+                if numbers:
+                    total_votes = max(numbers)
+                    break
+
+    return valid_votes, invalid_votes, total_votes
+
+
+class SortedNumbersStrategy(ExtractionStrategy):
+    """후보자 라인의 숫자를 크기순으로 계 > 분류 > 재확인에 배정"""
+
+    def parse(self, text: str, page_num: int,
+              words: Optional[pd.DataFrame] = None) -> PageData:
+        if self.verbose:
+            print_page_text(text, page_num, 2000)
+
+        # 데이터 추출
+        district, voting_type = extract_district_and_type(text)
+        candidates = extract_candidate_votes_improved(text)
+        valid_votes, invalid_votes, total_votes = extract_totals_improved(text)
+
+        # 기본 유형 설정 (페이지 번호 기반)
+        if not voting_type:
+            if page_num < 26:
+                voting_type = "관내사전"
+            elif page_num < 168:
+                voting_type = "선거일"
+            elif page_num == 168:
+                voting_type = "관외사전"
+            elif page_num == 169:
+                voting_type = "재외투표"
+            else:
+                voting_type = "거소/선상"
+
+        return PageData(
+            page_num=page_num + 1,
+            district=district or f"투표구_{page_num + 1}",
+            voting_type=voting_type,
+            candidates=candidates,
+            valid_votes=valid_votes,
+            invalid_votes=invalid_votes,
+            total_votes=total_votes
+        )
+
+
+# ---------------------------------------------------------------------------
+# CandidateLineStrategy / ColumnBBoxStrategy (analyze_election_v2.py)
+# ---------------------------------------------------------------------------
+
+def _find_sum_triple_py(numbers: List[int]) -> Tuple[int, int, int]:
+    """n1 + n2 == n3 인 서로 다른 위치 (i, j, k) 중 (i, j) 순서상 첫 조합, 없으면 (-1, -1, -1)"""
+    # k는 값만 맞으면 되므로 값별 개수로 확인 (i, j 자신이 합과 같은 경우는 제외)
+    counts = defaultdict(int)
+    for n in numbers:
+        counts[n] += 1
+    for i, n1 in enumerate(numbers):
+        for j, n2 in enumerate(numbers):
+            if i != j:
+                n3 = n1 + n2
+                if counts[n3] - (n1 == n3) - (n2 == n3) > 0:
+                    k = next(k for k, n in enumerate(numbers) if n == n3 and k != i and k != j)
+                    return i, j, k
+    return -1, -1, -1
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _find_sum_triple_jit(arr):
+        """_find_sum_triple_py와 같은 탐색 (int64 배열, nopython)"""
+        n = arr.shape[0]
+        for i in range(n):
+            for j in range(n):
+                if i != j:
+                    for k in range(n):
+                        if k != i and k != j and arr[i] + arr[j] == arr[k]:
+                            return i, j, k
+        return -1, -1, -1
+
+
+def _find_sum_triple(numbers: List[int]) -> Tuple[int, int, int]:
+    """합계 검증 조합 탐색 (numba가 있으면 JIT 버전 사용)"""
+    if numba is not None:
+        try:
+            return _find_sum_triple_jit(np.asarray(numbers, dtype=np.int64))
+        except OverflowError:
+            pass  # int64를 넘는 OCR 오인식 숫자는 파이썬 버전으로
+    return _find_sum_triple_py(numbers)
+
+
+def parse_candidate_line(line: str, candidate: str) -> Tuple[int, int, int]:
+    """후보자 라인에서 숫자 추출"""
+    # 후보자명 이후의 숫자들만 추출
+    idx = line.find(candidate)
+    if idx == -1:
+        return 0, 0, 0
+
+    after = line[idx + len(candidate):]
+    numbers = extract_all_numbers(after)
+
+    if not numbers:
+        return 0, 0, 0
+
+    # 숫자가 3개 이상이면 분류, 재확인, 계 순서로 추출
+    # 일반적으로: 분류 > 계 > 재확인 (크기 순)
+    if len(numbers) >= 3:
+        # 가장 큰 숫자 3개 선택
+        sorted_nums = sorted(numbers, reverse=True)[:3]
+        # 계 = 가장 큰 숫자
+        total = sorted_nums[0]
+        # 분류 = 두 번째로 큰 숫자
+        classified = sorted_nums[1]
+        # 재확인 = 세 번째로 큰 숫자
+        reconfirm = sorted_nums[2] if len(sorted_nums) > 2 else 0
+
+        # 검증: classified + reconfirm ≈ total
+        if abs((classified + reconfirm) - total) <= total * 0.1:
+            return classified, reconfirm, total
+        else:
+            # 다른 조합 시도
+            i, j, k = _find_sum_triple(numbers)
+            if i >= 0:
+                return numbers[i], numbers[j], numbers[k]
+
+    elif len(numbers) == 2:
+        return max(numbers), min(numbers), sum(numbers)
+    elif len(numbers) == 1:
+        return numbers[0], 0, numbers[0]
+
+    return 0, 0, 0
+
+
+def extract_row_numbers(words: pd.DataFrame, label: str, exact: bool = False) -> List[int]:
+    """라벨 단어와 같은 행에서 오른쪽에 있는 숫자들을 열 순서대로 추출"""
+    texts = words['text']
+    mask = (texts == label) if exact else texts.str.contains(label, regex=False)
+
+    for _, anchor in words[mask].iterrows():
+        # 라벨과 세로 위치가 반 줄 이내인 단어 = 같은 행
+        same_row = (words['top'] - anchor['top']).abs() < anchor['height'] / 2
+        row = words[same_row & (words['left'] > anchor['left'])].sort_values('left')
+
+        numbers = []
+        for token in row['text'].str.strip('|[]()'):
+            if _NUMBER_RE.fullmatch(token):
+                numbers.append(int(token.translate(_DIGITS_ONLY)))
+        if numbers:
+            return numbers
+
+    return []
+
+
+def parse_candidate_row(words: pd.DataFrame, candidate: str) -> Tuple[int, int, int]:
+    """후보자 행에서 열 위치로 분류/재확인/계 추출"""
+    numbers = extract_row_numbers(words, candidate)
+
+    # 오른쪽 세 열이 분류된 투표지, 재확인대상, 계
+    if len(numbers) >= 3:
+        return tuple(numbers[-3:])
+    elif len(numbers) == 2:
+        return max(numbers), min(numbers), sum(numbers)
+    elif len(numbers) == 1:
+        return numbers[0], 0, numbers[0]
+
+    return 0, 0, 0
+
+
+class CandidateLineStrategy(ExtractionStrategy):
+    """후보자명 뒤 숫자를 라인 단위로 추출하고 분류 + 재확인 = 계 조합 검증"""
+
+    def parse(self, text: str, page_num: int,
+              words: Optional[pd.DataFrame] = None) -> PageData:
+        if self.verbose:
+            print_page_text(text, page_num, 1500)
+
+        # 데이터 추출
+        data = PageData(page_num=page_num + 1)
+
+        # 투표구 추출
+        data.district = search_district(text) or f"투표구_{page_num + 1}"
+
+        # 투표유형 추출
+        if '관내사전' in text:
+            data.voting_type = "관내사전"
+        elif '선거일' in text:
+            data.voting_type = "선거일"
+        elif '관외사전' in text:
+            data.voting_type = "관외사전"
+        elif '재외' in text:
+            data.voting_type = "재외투표"
+        else:
+            # 페이지 기반 추정
+            if page_num < 26:
+                data.voting_type = "관내사전"
+            elif page_num < 168:
+                data.voting_type = "선거일"
+            else:
+                data.voting_type = "기타"
+
+        # 후보자별 득표 추출
+        lines = text.split('\n')
+        line_hits = find_candidate_lines(lines)
+        for target in TARGET_CANDIDATES:
+            classified, reconfirm, total = self.candidate_votes(target, lines, line_hits)
+            data.candidates.append(CandidateVote(
+                name=target,
+                classified=classified,
+                reconfirm=reconfirm,
+                total=total
+            ))
+
+        # 총계/유효/무효 추출
+        self.fill_totals(data, lines)
+        return data
+
+    def candidate_votes(self, target: str, lines: List[str],
+                        line_hits: Dict[str, List[int]]) -> Tuple[int, int, int]:
+        """후보자 한 명의 분류/재확인/계"""
+        for i in line_hits.get(target, ()):
+            votes = parse_candidate_line(lines[i], target)
+            if votes[2] > 0:
+                return votes
+        return 0, 0, 0
+
+    def fill_totals(self, data: PageData, lines: List[str]):
+        """총계/유효/무효 채우기"""
+        for line in lines:
+            if line.strip().startswith('계') or '계\t' in line:
+                numbers = extract_all_numbers(line)
+                if numbers:
+                    sorted_nums = sorted(numbers, reverse=True)
+                    data.total_votes = sorted_nums[0]
+                    data.valid_votes = sorted_nums[1] if len(sorted_nums) > 1 else sorted_nums[0]
+
+            if '무효' in line:
+                numbers = extract_all_numbers(line)
+                if numbers:
+                    data.invalid_votes = min(numbers)
+
+
+class ColumnBBoxStrategy(ExtractionStrategy):
+    """감싼 전략의 결과에서 후보자 득표만 단어 좌표(TSV) 열 위치로 교체
+
+    투표구/유형/총계는 감싼 전략(기본: CandidateLineStrategy)을 그대로 따르고,
+    좌표로 행을 못 읽은 후보자나 좌표가 없는 페이지(텍스트 레이어)는 감싼 전략 값을 쓴다.
+    """
+
+    layout = True
+
+    def __init__(self, verbose: bool = False, base: Optional[ExtractionStrategy] = None):
+        super().__init__(verbose)
+        self.base = base or CandidateLineStrategy(verbose)
+
+    def parse(self, text: str, page_num: int,
+              words: Optional[pd.DataFrame] = None) -> PageData:
+        data = self.base.parse(text, page_num)
+        if words is None:
+            return data
+
+        # 오른쪽 세 열 = 분류된 투표지, 재확인대상, 계
+        for c in data.candidates:
+            votes = parse_candidate_row(words, c.name)
+            if votes[2] > 0:
+                c.classified, c.reconfirm, c.total = votes
+
+        # 감싼 전략이 못 찾은 총계/무효만 계·무효 행의 열로 채움
+        if not data.total_votes:
+            numbers = extract_row_numbers(words, '계', exact=True)
+            if numbers:
+                sorted_nums = sorted(numbers, reverse=True)
+                data.total_votes = sorted_nums[0]
+                data.valid_votes = sorted_nums[1] if len(sorted_nums) > 1 else sorted_nums[0]
+        if not data.invalid_votes:
+            numbers = extract_row_numbers(words, '무효')
+            if numbers:
+                data.invalid_votes = min(numbers)
+
+        return data
+
+
+# ---------------------------------------------------------------------------
+# WindowRegexStrategy (simple_extract.py)
+# ---------------------------------------------------------------------------
+
+class WindowRegexStrategy(ExtractionStrategy):
+    """전체 텍스트에서 후보자명 이후 숫자 3개를 정규식으로 추출"""
+
+    def parse(self, text: str, page_num: int,
+              words: Optional[pd.DataFrame] = None) -> PageData:
+        if self.verbose:
+            print_page_text(text, page_num, 1500)
+
+        # 투표구 추출
+        data = PageData(page_num=page_num + 1)
+        data.district = search_district(text) or f"page_{page_num + 1}"
+
+        # 투표유형
+        if '관내사전' in text:
+            data.voting_type = "관내사전"
+        elif '선거일' in text:
+            data.voting_type = "선거일"
+        elif '관외사전' in text:
+            data.voting_type = "관외사전"
+        else:
+            data.voting_type = "관내사전" if page_num < 26 else "선거일"
+
+        # 후보자별 득표 - 전체 텍스트에서 추출
+        positions = find_candidates(text)
+        for candidate in TARGET_CANDIDATES:
+            # 후보자명 이후의 숫자들 찾기
+            pos = positions.get(candidate)
+            match = _CANDIDATE_RES[candidate].match(text, pos) if pos is not None else None
+
+            classified = reconfirm = total = 0
+            if match:
+                # 캡처 그룹은 항상 숫자로 시작
+                nums = [int(g.translate(_DIGITS_ONLY)) for g in match.groups() if g]
+                nums = [n for n in nums if n > 0]
+
+                if len(nums) >= 3:
+                    # 가장 큰 숫자가 총계일 가능성 높음
+                    sorted_nums = sorted(nums, reverse=True)
+                    total = sorted_nums[0]
+                    classified = sorted_nums[1] if len(sorted_nums) > 1 else 0
+                    reconfirm = sorted_nums[2] if len(sorted_nums) > 2 else 0
+                elif len(nums) == 2:
+                    classified, reconfirm = max(nums), min(nums)
+                    total = classified + reconfirm
+                elif len(nums) == 1:
+                    total = classified = nums[0]
+
+            data.candidates.append(CandidateVote(candidate, classified, reconfirm, total))
+
+        # 총계 추출
+        total_match = _TOTAL_RE.search(text)
+        if total_match:
+            nums = [int(g.translate(_DIGITS_ONLY)) for g in total_match.groups() if g]
+            data.valid_votes = data.total_votes = max(nums) if nums else 0
+
+        # 무효
+        invalid_match = _INVALID_RE.search(text)
+        if invalid_match:
+            data.invalid_votes = int(invalid_match.group(1))
+
+        return data
+
+
+STRATEGIES = {
+    'sorted': SortedNumbersStrategy,
+    'line': CandidateLineStrategy,
+    'bbox': ColumnBBoxStrategy,
+    'window': WindowRegexStrategy,
+}
@@ -0,0 +1,61 @@
+"""
+OCR 결과 디스크 캐시
+페이지 이미지 해시를 키로 OCR 텍스트를 저장하여, 추출 로직만 고쳐서
+다시 실행할 때 바뀌지 않은 페이지의 OCR을 생략합니다.
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import Callable, Optional
+
+DEFAULT_CACHE_DIR = '.ocr_cache'
+
+
+def cache_key(samples: bytes, *parts) -> str:
+    """이미지 픽셀과 OCR 설정(크기, 언어, config 등)으로 캐시 키 생성"""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(str(part).encode('utf-8') + b'\0')
+    h.update(samples)
+    return h.hexdigest()
+
+
+class OcrCache:
+    """캐시 키 → OCR 텍스트 저장소
+
+    키마다 파일 하나를 두고 임시 파일 + os.replace로 기록하므로
+    프로세스 풀의 여러 워커가 동시에 써도 안전하다.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        """저장된 텍스트 (없으면 None)"""
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, text: str):
+        """텍스트 저장"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def fetch(self, key: str, run: Callable[[], str]) -> str:
+        """캐시에 있으면 반환, 없으면 run() 결과를 저장 후 반환"""
+        text = self.get(key)
+        if text is None:
+            text = run()
+            self.put(key, text)
+        return text
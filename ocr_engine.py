@@ -0,0 +1,776 @@
+"""
+개표상황표 PDF 렌더링 / OCR 엔진
+PDF 렌더링, 텍스트 레이어, Tesseract OCR(단일/배치/비동기) 또는 GPU OCR
+(PaddleOCR/docTR)과 페이지 단위 동시 실행기를 모든 스크립트가 공유합니다.
+추출 방식은 extractors의 전략 객체로 주입합니다.
+"""
+
+import asyncio
+import contextlib
+import csv
+import importlib.util
+import io
+import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import fitz  # PyMuPDF
+import numpy as np
+import pandas as pd
+import pytesseract
+from PIL import Image
+
+from extractors import ExtractionStrategy, PageData, TARGET_CANDIDATES, recognized_candidates
+from ocr_cache import OcrCache, cache_key
+
+try:
+    import aiopytesseract  # 선택: 비동기 OCR
+except ImportError:
+    aiopytesseract = None
+
+# OCR 설정 (한국어 + 영어)
+OCR_LANG = 'kor+eng'
+OCR_CONFIG = r'--oem 3 --psm 6'
+OCR_TIMEOUT = 120  # 페이지당 초
+PIPELINE_QUEUE_SIZE = 8  # 파이프라인 단계 간 큐 크기
+LAYOUT_MIN_CONF = 30  # 좌표 기반 추출에 사용할 최소 OCR 신뢰도
+
+# 렌더링 배율 (PDF 기준 72 DPI x 배율)
+DEFAULT_SCALE = 2.0
+RETRY_SCALE = 3.0     # 인식이 부족한 페이지 재시도 배율
+MIN_RECOGNIZED = 3    # 재시도 기준: 인식된 후보자 수
+_MAT = fitz.Matrix(DEFAULT_SCALE, DEFAULT_SCALE)
+
+# 이 길이를 넘고 후보자명이 있으면 PDF 텍스트 레이어를 OCR 대신 사용
+MIN_TEXT_LAYER_CHARS = 200
+
+RUNNERS = ['batch', 'pipeline', 'async', 'process']
+
+# 페이지 처리가 끝날 때마다 호출 (CSV 스트리밍 등)
+PageCallback = Optional[Callable[[PageData], None]]
+
+# Tesseract 프로세스당 OpenMP 스레드 수 (동시 워커 기본값 = CPU 코어 수 / 스레드 수)
+TESS_THREADS = 4
+
+# OCR 백엔드: Tesseract(CPU) 또는 GPU 모델 (선택 설치, 처음 사용할 때 로드)
+BACKENDS = ['tesseract', 'paddle', 'doctr']
+_BACKEND_MODULES = {'paddle': 'paddleocr', 'doctr': 'doctr'}
+# GPU 추론 정밀도 (auto: bf16 지원 GPU면 bf16, 아니면 fp32)
+DTYPES = ['auto', 'fp32', 'bf16', 'fp8']
+GPU_BATCH_PAGES = 8  # docTR 한 번에 넣는 페이지 수 (전체를 메모리에 올리지 않음)
+
+# GPU 백엔드 결과를 Tesseract image_to_data와 같은 TSV로 변환할 때의 열
+_TSV_COLUMNS = ['level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+                'left', 'top', 'width', 'height', 'conf', 'text']
+
+
+# 전처리 작업 버퍼 (스레드마다 한 벌, 같은 크기 페이지끼리 재사용)
+_work = threading.local()
+
+
+def _work_buffers(height: int, width: int) -> Tuple[np.ndarray, ...]:
+    """대비/샤프닝용 uint8 결과 버퍼 + int16 작업 버퍼 (크기가 바뀔 때만 새로 할당)"""
+    bufs = getattr(_work, 'bufs', None)
+    if bufs is None or bufs[0].shape != (height, width):
+        bufs = (np.empty((height, width), np.uint8),             # 결과
+                np.empty((height, width), np.int16),             # 대비 적용 값
+                np.empty((height, width - 2), np.int16),         # 가로 3칸 합
+                np.empty((height - 2, width - 2), np.int16))     # 3x3 합 → 샤프닝 값
+        _work.bufs = bufs
+    return bufs
+
+
+def _contrast_lut(img: Image.Image, factor: float = 2.0) -> np.ndarray:
+    """ImageEnhance.Contrast와 같은 256칸 LUT (평균 밝기는 히스토그램으로 계산, 이미지 복사 없음)"""
+    hist = img.histogram()
+    # PIL과 동일: 평균 밝기(반올림) 기준으로 factor배 확대 후 0~255로 자름
+    mean = int(np.dot(np.arange(256), hist) / max(sum(hist), 1) + 0.5)
+    return np.clip(mean + factor * (np.arange(256) - mean), 0, 255).astype(np.uint8)
+
+
+def enhance_contrast(img: Image.Image) -> Image.Image:
+    """전처리: 대비 향상 (LUT 한 번, 결과 이미지 외 할당 없음)"""
+    if img.mode != 'L':
+        img = img.convert('L')
+    return img.point(_contrast_lut(img).tolist())
+
+
+def enhance_and_sharpen(img: Image.Image) -> Image.Image:
+    """전처리: 대비 향상 + 샤프닝 (ImageFilter.SHARPEN과 같은 3x3 커널, 재사용 버퍼에서 계산)"""
+    enhanced = enhance_contrast(img)
+    width, height = enhanced.size
+    if height <= 2 or width <= 2:
+        return enhanced
+    out, a, rows, inner = _work_buffers(height, width)
+
+    # 대비 적용 결과를 버퍼로 읽어 들임 (가장자리 픽셀은 그대로 결과가 됨)
+    pixels = np.frombuffer(enhanced.tobytes(), np.uint8).reshape(height, width)
+    np.copyto(out, pixels)
+    np.copyto(a, pixels)
+    del enhanced, pixels
+
+    # 커널: 중심 32, 이웃 -2, /16 → (17*중심 - 3x3 합 + 4) >> 3
+    np.add(a[:, :-2], a[:, 1:-1], out=rows)
+    np.add(rows, a[:, 2:], out=rows)
+    np.add(rows[:-2], rows[1:-1], out=inner)
+    np.add(inner, rows[2:], out=inner)
+    center = rows[:-2]  # 가로 합은 더 쓰지 않으므로 17*중심 자리로 재사용
+    np.multiply(a[1:-1, 1:-1], 17, out=center)
+    np.subtract(center, inner, out=inner)
+    np.add(inner, 4, out=inner)
+    np.right_shift(inner, 3, out=inner)
+    np.clip(inner, 0, 255, out=inner)
+    np.copyto(out[1:-1, 1:-1], inner, casting='unsafe')
+
+    # 버퍼는 다음 페이지에 재사용하므로 결과 이미지는 복사본
+    return Image.frombytes('L', (width, height), out)
+
+
+@dataclass
+class OcrOptions:
+    """페이지 렌더링/OCR 설정 (프로세스 풀 워커로 그대로 전달)"""
+    config: str = OCR_CONFIG
+    preprocess: Optional[Callable[[Image.Image], Image.Image]] = None
+    scale: float = DEFAULT_SCALE
+    text_layer: bool = True  # False면 텍스트 레이어가 있어도 OCR
+    cache: Optional[OcrCache] = None
+    backend: str = 'tesseract'
+    dtype: str = 'auto'  # GPU 백엔드 추론 정밀도 (analyze_pdf에서 fp32/bf16으로 확정)
+    threads: int = TESS_THREADS  # Tesseract 프로세스당 스레드 수
+    reco_model: Optional[str] = None  # docTR 인식 모델 (Hugging Face Hub ID, 한글 어휘 필요)
+
+
+def _matrix(scale: float) -> fitz.Matrix:
+    """렌더링 배율 행렬 (기본 배율은 모듈 상수 재사용)"""
+    return _MAT if scale == DEFAULT_SCALE else fitz.Matrix(scale, scale)
+
+
+def page_text_layer(page) -> Optional[str]:
+    """PDF에 내장된 텍스트 레이어 (개표상황표 내용이 있을 때만)"""
+    text = page.get_text("text")
+    if len(text.strip()) > MIN_TEXT_LAYER_CHARS and any(c in text for c in TARGET_CANDIDATES):
+        return text
+    return None
+
+
+def render_page(doc, page_num: int, options: OcrOptions) -> Image.Image:
+    """페이지를 OCR용 그레이스케일 이미지로 변환"""
+    # 그레이스케일(1바이트/픽셀)로 바로 렌더링, PNG 인코딩/디코딩 생략
+    pix = doc[page_num].get_pixmap(matrix=_matrix(options.scale), colorspace=fitz.csGRAY,
+                                   alpha=False)
+    img = Image.frombytes('L', (pix.width, pix.height), pix.samples)
+
+    # 이미지 전처리
+    return options.preprocess(img) if options.preprocess else img
+
+
+def ocr_key(img: Image.Image, options: OcrOptions, layout: bool = False) -> str:
+    """OCR 캐시 키 (이미지 + 설정)"""
+    if options.backend != 'tesseract':
+        return cache_key(img.tobytes(), img.size, options.backend, options.dtype,
+                         options.reco_model or '', 'tsv')
+    return cache_key(img.tobytes(), img.size, OCR_LANG, options.config,
+                     'tsv' if layout else 'text')
+
+
+def backend_available(backend: str) -> bool:
+    """OCR 백엔드 패키지 설치 여부"""
+    module = _BACKEND_MODULES.get(backend)
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+# 프로세스별 GPU 모델 (로드 비용이 커서 한 번만 생성)
+_gpu_models = {}
+
+
+def _gpu_model(options: OcrOptions):
+    """PaddleOCR / docTR 모델 로드
+
+    docTR 기본 사전학습 인식 모델은 한글 어휘가 없어 후보자명을 읽지 못하므로
+    한글 인식 모델(options.reco_model)을 지정해야 하고, 어휘에 후보자명 글자가 없으면 거부한다.
+    """
+    backend = options.backend
+    if backend not in _gpu_models:
+        if backend == 'paddle':
+            from paddleocr import PaddleOCR
+            _gpu_models[backend] = PaddleOCR(lang='korean', use_gpu=True, show_log=False)
+        else:
+            if not options.reco_model:
+                raise RuntimeError("docTR는 한글 인식 모델 지정 필요 (--doctr-reco)")
+            import torch
+            from doctr.models import from_hub, ocr_predictor
+            reco = from_hub(options.reco_model)
+            missing = set(''.join(TARGET_CANDIDATES)) - set(reco.vocab)
+            if missing:
+                raise RuntimeError(f"docTR 인식 모델 {options.reco_model} 어휘에 후보자명 글자 없음: "
+                                   f"{''.join(sorted(missing))}")
+            model = ocr_predictor(det_arch='db_resnet50', reco_arch=reco, pretrained=True)
+            _gpu_models[backend] = model.cuda() if torch.cuda.is_available() else model
+    return _gpu_models[backend]
+
+
+def resolve_dtype(backend: str, dtype: str) -> str:
+    """GPU 추론 정밀도 확정 (docTR만 bf16 지원, 나머지는 fp32)"""
+    if backend != 'doctr':
+        if dtype in ('bf16', 'fp8'):
+            print(f"⚠️  {backend} 백엔드는 {dtype} 미지원: fp32 사용")
+        return 'fp32'
+
+    import torch
+    bf16_ok = torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+    if dtype == 'fp8':
+        # FP8 행렬곱은 vLLM/Transformer Engine 같은 전용 런타임이 필요
+        print("⚠️  docTR는 fp8 추론 미지원: bf16으로 전환")
+        dtype = 'bf16'
+    if dtype == 'auto':
+        return 'bf16' if bf16_ok else 'fp32'
+    if dtype == 'bf16' and not bf16_ok:
+        print("⚠️  bf16 미지원 GPU(또는 CPU): fp32 사용")
+        return 'fp32'
+    return dtype
+
+
+def _inference_precision(dtype: str):
+    """docTR 추론 정밀도 컨텍스트 (bf16이면 CUDA autocast)"""
+    if dtype != 'bf16':
+        return contextlib.nullcontext()
+    import torch
+    return torch.autocast(device_type='cuda', dtype=torch.bfloat16)
+
+
+def _boxes_to_tsv(boxes: List[Tuple[int, int, int, int, float, str]]) -> str:
+    """(left, top, width, height, conf, text) 상자 목록 → Tesseract TSV
+
+    세로 위치가 반 줄 이내인 상자를 한 줄로 묶고 줄 안에서는 왼쪽부터 정렬한다.
+    """
+    rows = []
+    line_num = 0
+    line_top = line_height = None
+    for box in sorted(boxes, key=lambda b: b[1]):
+        if line_top is None or box[1] - line_top >= line_height / 2:
+            line_num += 1
+            line_top, line_height = box[1], max(box[3], 1)
+        rows.append((line_num,) + box)
+
+    lines = ['\t'.join(_TSV_COLUMNS)]
+    for word_num, (line, left, top, width, height, conf, text) in enumerate(sorted(rows), 1):
+        text = text.replace('\t', ' ')
+        lines.append(f"5\t1\t1\t1\t{line}\t{word_num}\t{left}\t{top}\t{width}\t{height}\t{conf:.0f}\t{text}")
+    return '\n'.join(lines) + '\n'
+
+
+def _rgb_array(image) -> np.ndarray:
+    """PIL 이미지 또는 이미지 파일 경로 → RGB 배열"""
+    if isinstance(image, str):
+        with Image.open(image) as img:
+            return np.asarray(img.convert('RGB'))
+    return np.asarray(image.convert('RGB'))
+
+
+def gpu_ocr(images: Sequence, options: OcrOptions) -> List[str]:
+    """GPU 백엔드로 OCR하여 페이지별 TSV 반환 (이미지 또는 이미지 파일 경로)"""
+    model = _gpu_model(options)
+
+    outputs = []
+    if options.backend == 'paddle':
+        # PaddleOCR 2.x ocr()는 이미지 한 장씩 (인식 단계는 내부에서 배치)
+        for image in images:
+            arr = _rgb_array(image)
+            boxes = []
+            for points, (text, score) in (model.ocr(arr, cls=False)[0] or []):
+                xs = [int(x) for x, _ in points]
+                ys = [int(y) for _, y in points]
+                boxes.append((min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys),
+                              score * 100, text))
+            outputs.append(_boxes_to_tsv(boxes))
+        return outputs
+
+    # docTR: 페이지 목록을 넣으면 내부에서 배치 처리 (GPU_BATCH_PAGES장씩 읽어서)
+    pages = []
+    for start in range(0, len(images), GPU_BATCH_PAGES):
+        arrays = [_rgb_array(image) for image in images[start:start + GPU_BATCH_PAGES]]
+        with _inference_precision(options.dtype):
+            result = model(arrays)
+        pages += result.export()['pages']
+    for page in pages:
+        height, width = page['dimensions']
+        boxes = []
+        for block in page['blocks']:
+            for line in block['lines']:
+                for word in line['words']:
+                    (x0, y0), (x1, y1) = word['geometry']
+                    boxes.append((int(x0 * width), int(y0 * height), int((x1 - x0) * width),
+                                  int((y1 - y0) * height), word['confidence'] * 100,
+                                  word['value']))
+        outputs.append(_boxes_to_tsv(boxes))
+    return outputs
+
+
+def words_to_text(words: pd.DataFrame) -> str:
+    """단어 단위 OCR 결과를 줄 단위 텍스트로 복원"""
+    lines = words.groupby(['block_num', 'par_num', 'line_num'], sort=False)['text']
+    return '\n'.join(lines.agg(' '.join))
+
+
+def ocr_page(img: Image.Image, options: OcrOptions,
+             layout: bool = False) -> Tuple[str, Optional[pd.DataFrame]]:
+    """OCR 실행 (layout=True이면 단어별 좌표(TSV)도 반환, 캐시가 있으면 재사용)"""
+    # GPU 백엔드는 항상 단어 좌표(TSV)를 낸다
+    layout = layout or options.backend != 'tesseract'
+
+    def run():
+        if options.backend != 'tesseract':
+            return gpu_ocr([img], options)[0]
+        if layout:
+            return pytesseract.image_to_data(img, lang=OCR_LANG, config=options.config)
+        return pytesseract.image_to_string(img, lang=OCR_LANG, config=options.config)
+
+    cache = options.cache
+    output = run() if cache is None else cache.fetch(ocr_key(img, options, layout), run)
+    return parse_ocr_output(output, layout)
+
+
+def parse_ocr_output(output: str, layout: bool) -> Tuple[str, Optional[pd.DataFrame]]:
+    """OCR 출력 → (텍스트, 단어 좌표 DataFrame 또는 None)"""
+    if not layout:
+        return output, None
+
+    # Output.DATAFRAME과 같은 방식으로 TSV 파싱 (캐시는 TSV 문자열로 저장)
+    words = pd.read_csv(io.StringIO(output), sep='\t', quoting=csv.QUOTE_NONE)
+    words = words.dropna(subset=['text'])
+    words['text'] = words['text'].astype(str).str.strip()
+    words = words[words['text'] != '']
+
+    return words_to_text(words), words[words['conf'] > LAYOUT_MIN_CONF]
+
+
+def ocr_page_batched(image_paths: Sequence[str], options: OcrOptions) -> List[str]:
+    """여러 페이지 이미지 파일을 Tesseract 한 번으로 OCR (페이지마다 반복되는 프로세스 기동 비용 제거)
+
+    GPU 백엔드는 모델에 페이지를 묶어서 넘기고 페이지별 TSV를 반환한다.
+    """
+    if options.backend != 'tesseract':
+        return gpu_ocr(image_paths, options)
+
+    # 이미지 목록 파일 하나로 Tesseract 한 번 실행
+    with tempfile.TemporaryDirectory() as tmpdir:
+        list_path = os.path.join(tmpdir, "pages.txt")
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(image_paths) + '\n')
+        output = pytesseract.image_to_string(list_path, lang=OCR_LANG, config=options.config)
+
+    # 폼피드(\x0c)로 페이지별 텍스트 분리
+    chunks = output.split('\x0c')
+    if len(chunks) < len(image_paths):
+        raise RuntimeError(f"배치 OCR 결과 페이지 수 불일치: {len(chunks)} < {len(image_paths)}")
+    return chunks[:len(image_paths)]
+
+
+def _async_kwargs(config: str) -> dict:
+    """Tesseract 설정 문자열을 aiopytesseract 인자로 변환"""
+    tokens = config.split()
+    kwargs = {}
+    extra = []
+    for flag, value in zip(tokens, tokens[1:]):
+        if flag == '--oem':
+            kwargs['oem'] = int(value)
+        elif flag == '--psm':
+            kwargs['psm'] = int(value)
+        elif flag == '-c':
+            extra.append(tuple(value.split('=', 1)))
+    if extra:
+        kwargs['config'] = extra
+    return kwargs
+
+
+async def ocr_page_async(png: bytes, options: OcrOptions) -> str:
+    """aiopytesseract로 PNG 한 장 OCR"""
+    return await aiopytesseract.image_to_string(png, lang=OCR_LANG, timeout=OCR_TIMEOUT,
+                                                **_async_kwargs(options.config))
+
+
+def read_page(doc, page_num: int, strategy: ExtractionStrategy,
+              options: OcrOptions) -> Optional[PageData]:
+    """단일 페이지 처리: 텍스트 레이어 또는 OCR → 전략으로 파싱"""
+    try:
+        # 디지털 생성 PDF면 텍스트 레이어를 바로 사용 (OCR 생략)
+        text = page_text_layer(doc[page_num]) if options.text_layer else None
+        words = None
+        if text is None:
+            img = render_page(doc, page_num, options)
+            text, words = ocr_page(img, options, strategy.layout)
+
+        return strategy.parse(text, page_num, words)
+
+    except Exception as e:
+        print(f"\nError page {page_num + 1}: {e}")
+        return None
+
+
+def _parse(strategy: ExtractionStrategy, text: str, page_num: int,
+           words: Optional[pd.DataFrame] = None, layout: bool = False) -> Optional[PageData]:
+    """페이지 파싱 (layout=True면 text는 TSV 원문), 오류는 출력 후 None"""
+    try:
+        if layout:
+            text, words = parse_ocr_output(text, layout)
+        return strategy.parse(text, page_num, words)
+    except Exception as e:
+        print(f"\nError page {page_num + 1}: {e}")
+        return None
+
+
+def _print_progress(done: int, count: int):
+    print(f"\r⏳ 처리: {done}/{count} ({done * 100 // count}%)", end="", flush=True)
+
+
+def _limit_tess_threads(threads: int):
+    """이후 실행되는 Tesseract 서브프로세스의 OpenMP 스레드 수 제한"""
+    os.environ['OMP_THREAD_LIMIT'] = str(threads)
+
+
+# 워커 프로세스별 PDF 핸들 (fitz.Document는 pickle 불가)
+_worker_doc = None
+
+
+def _init_worker(pdf_path: str, threads: int):
+    """워커 프로세스 초기화: PDF를 프로세스당 한 번만 연다"""
+    global _worker_doc
+    # 워커 수 x 스레드 수가 코어 수를 넘지 않아야 경합이 없음
+    _limit_tess_threads(threads)
+    _worker_doc = fitz.open(pdf_path)
+
+
+def _read_page_worker(page_num: int, strategy: ExtractionStrategy,
+                      options: OcrOptions) -> Optional[PageData]:
+    """프로세스 풀에서 실행되는 페이지 처리"""
+    return read_page(_worker_doc, page_num, strategy, options)
+
+
+def run_pool(pdf_path: str, pages: Sequence[int], strategy: ExtractionStrategy,
+             options: OcrOptions, concurrency: int, on_page: PageCallback = None) -> List[PageData]:
+    """프로세스 풀로 페이지 단위 병렬 처리 (끝나는 순서대로 on_page 호출)"""
+    results = []
+    with ProcessPoolExecutor(max_workers=concurrency, initializer=_init_worker,
+                             initargs=(pdf_path, options.threads)) as executor:
+        futures = [executor.submit(_read_page_worker, i, strategy, options) for i in pages]
+        for done, future in enumerate(as_completed(futures), 1):
+            _print_progress(done, len(pages))
+            data = future.result()
+            if data:
+                results.append(data)
+                if on_page:
+                    on_page(data)
+    results.sort(key=lambda d: d.page_num)
+    return results
+
+
+def run_pipeline(pdf_path: str, pages: Sequence[int], strategy: ExtractionStrategy,
+                 options: OcrOptions, concurrency: int,
+                 on_page: PageCallback = None) -> List[PageData]:
+    """렌더링 → OCR → 파싱 3단계 스레드 파이프라인
+
+    렌더링 스레드 1개가 이미지를 만들고, OCR 스레드 N개가 Tesseract
+    서브프로세스를 돌리는 동안 호출 스레드가 파싱을 맡는다. 단계 사이는
+    크기 제한 큐로 연결되고 None 센티널로 종료를 알린다. 텍스트 레이어가
+    있는 페이지는 렌더링 단계에서 OCR을 건너뛰고 바로 파싱 큐로 보낸다.
+    """
+    # OCR 스레드마다 Tesseract 프로세스 하나 (프로세스당 options.threads 스레드)
+    _limit_tess_threads(options.threads)
+
+    render_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    text_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    errors = []  # 렌더링 스레드의 치명적 오류 (호출 스레드에서 다시 발생)
+
+    def render_stage():
+        doc = None
+        try:
+            # fitz.Document는 스레드 간 공유하지 않음
+            doc = fitz.open(pdf_path)
+            for page_num in pages:
+                try:
+                    layer = page_text_layer(doc[page_num]) if options.text_layer else None
+                    if layer is not None:
+                        text_q.put((page_num, layer, None))
+                        continue
+                    render_q.put((page_num, render_page(doc, page_num, options)))
+                except Exception as e:
+                    print(f"\nError page {page_num + 1}: {e}")
+        except Exception as e:
+            errors.append(e)
+        finally:
+            # 어떤 경우에도 센티널을 보내야 OCR/파싱 단계가 멈추지 않음
+            if doc is not None:
+                doc.close()
+            for _ in range(concurrency):
+                render_q.put(None)
+
+    def ocr_stage():
+        while True:
+            item = render_q.get()
+            if item is None:
+                break
+            page_num, img = item
+            try:
+                text, words = ocr_page(img, options, strategy.layout)
+            except Exception as e:
+                print(f"\nError page {page_num + 1}: {e}")
+                continue
+            text_q.put((page_num, text, words))
+        text_q.put(None)
+
+    threads = [threading.Thread(target=render_stage, daemon=True)]
+    threads += [threading.Thread(target=ocr_stage, daemon=True) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+
+    # 파싱 단계 (호출 스레드)
+    results = []
+    finished = 0
+    done = 0
+    while finished < concurrency:
+        item = text_q.get()
+        if item is None:
+            finished += 1
+            continue
+        page_num, text, words = item
+        done += 1
+        _print_progress(done, len(pages))
+        data = _parse(strategy, text, page_num, words)
+        if data:
+            results.append(data)
+            if on_page:
+                on_page(data)
+
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+
+    results.sort(key=lambda d: d.page_num)
+    return results
+
+
+async def _run_async(pdf_path: str, pages: Sequence[int], strategy: ExtractionStrategy,
+                     options: OcrOptions, concurrency: int,
+                     on_page: PageCallback = None) -> List[PageData]:
+    _limit_tess_threads(options.threads)
+
+    # 렌더링은 PyMuPDF로 순차 처리 (빠름)
+    doc = fitz.open(pdf_path)
+    cache = options.cache
+    results = []
+    ocr_pages = []
+    images = []
+    keys = []
+    for page_num in pages:
+        text = page_text_layer(doc[page_num]) if options.text_layer else None
+        img = key = None
+        if text is None:
+            img = render_page(doc, page_num, options)
+            if cache is not None:
+                key = ocr_key(img, options)
+                text = cache.get(key)
+        if text is not None:
+            data = _parse(strategy, text, page_num)
+            if data:
+                results.append(data)
+                if on_page:
+                    on_page(data)
+            continue
+        buf = io.BytesIO()
+        img.save(buf, format='PNG')
+        ocr_pages.append(page_num)
+        images.append(buf.getvalue())
+        keys.append(key)
+    doc.close()
+
+    sem = asyncio.Semaphore(concurrency)
+    done = len(results)
+
+    async def ocr_one(png: bytes, page_num: int, key: Optional[str]) -> Optional[PageData]:
+        """세마포어로 동시 실행 수를 제한하며 한 페이지 OCR"""
+        nonlocal done
+        async with sem:
+            try:
+                text = await ocr_page_async(png, options)
+            except Exception as e:
+                print(f"\nError page {page_num + 1}: {e}")
+                return None
+        if cache is not None:
+            cache.put(key, text)
+        done += 1
+        _print_progress(done, len(pages))
+        data = _parse(strategy, text, page_num)
+        if data and on_page:
+            on_page(data)
+        return data
+
+    tasks = [ocr_one(png, i, key) for i, png, key in zip(ocr_pages, images, keys)]
+    results += [data for data in await asyncio.gather(*tasks) if data]
+    results.sort(key=lambda d: d.page_num)
+    return results
+
+
+def run_async(pdf_path: str, pages: Sequence[int], strategy: ExtractionStrategy,
+              options: OcrOptions, concurrency: int, on_page: PageCallback = None) -> List[PageData]:
+    """aiopytesseract로 페이지 OCR을 비동기 동시 실행"""
+    return asyncio.run(_run_async(pdf_path, pages, strategy, options, concurrency, on_page))
+
+
+def run_batched(pdf_path: str, pages: Sequence[int], strategy: ExtractionStrategy,
+                options: OcrOptions, concurrency: int = None,
+                on_page: PageCallback = None) -> List[PageData]:
+    """Tesseract 단일 호출 (또는 GPU 모델 일괄 추론) 배치 OCR
+
+    OCR이 필요한 페이지는 렌더링하는 즉시 임시 PNG로 내보내고(메모리에는 한 장만 유지)
+    ocr_page_batched로 한 번에 처리한다. 텍스트 레이어나 캐시에 있는 페이지는 배치에서 제외한다.
+    """
+    _limit_tess_threads(options.threads)
+
+    # GPU 백엔드는 단어 좌표(TSV)를 내므로 좌표 기반 전략에 그대로 전달
+    layout = options.backend != 'tesseract'
+    cache = options.cache
+    layers = {}
+    outputs = {}
+    ocr_pages = []
+    image_paths = []
+    keys = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        doc = fitz.open(pdf_path)
+        try:
+            for n, i in enumerate(pages, 1):
+                print(f"\r🖼️  렌더링: {n}/{len(pages)} ({n * 100 // len(pages)}%)", end="", flush=True)
+                layer = page_text_layer(doc[i]) if options.text_layer else None
+                if layer is not None:
+                    layers[i] = layer
+                    continue
+                img = render_page(doc, i, options)
+                # 캐시 키는 렌더링 시점에 계산 (이미지는 파일로 내보낸 뒤 버림)
+                if cache is not None:
+                    keys[i] = ocr_key(img, options, layout)
+                    hit = cache.get(keys[i])
+                    if hit is not None:
+                        outputs[i] = hit
+                        continue
+                path = os.path.join(tmpdir, f"page_{i:04d}.png")
+                img.save(path)
+                ocr_pages.append(i)
+                image_paths.append(path)
+        finally:
+            doc.close()
+
+        if layers:
+            print(f"\n📑 텍스트 레이어 사용: {len(layers)} 페이지 (OCR 생략)", end="")
+        if outputs:
+            print(f"\n💾 OCR 캐시 사용: {len(outputs)} 페이지", end="")
+
+        if image_paths:
+            print(f"\n⏳ OCR 실행 중: {len(image_paths)} 페이지 일괄 처리 ({options.backend})...",
+                  flush=True)
+            for i, output in zip(ocr_pages, ocr_page_batched(image_paths, options)):
+                outputs[i] = output
+                if cache is not None:
+                    cache.put(keys[i], output)
+
+    results = []
+    for i in pages:
+        if i in layers:
+            data = _parse(strategy, layers[i], i)
+        else:
+            data = _parse(strategy, outputs[i], i, layout=layout)
+        if data:
+            results.append(data)
+            if on_page:
+                on_page(data)
+    return results
+
+
+_RUNNER_FUNCS = {
+    'batch': run_batched,
+    'pipeline': run_pipeline,
+    'async': run_async,
+    'process': run_pool,
+}
+
+
+def analyze_pdf(pdf_path: str, pages: Sequence[int], strategy: ExtractionStrategy,
+                options: OcrOptions, runner: str = 'process', concurrency: int = None,
+                on_page: PageCallback = None) -> List[PageData]:
+    """PDF 분석: 선택한 실행 방식으로 페이지를 처리하고 인식 부족 페이지는 재시도
+
+    on_page는 페이지 결과가 확정되는 즉시 페이지마다 한 번 호출된다.
+    재시도 대상 페이지는 재시도가 끝난 뒤 더 나은 결과로 호출된다.
+    """
+    # 기본 동시 실행 수: 코어를 Tesseract 프로세스당 스레드 수로 나눔
+    default_workers = max(1, (os.cpu_count() or 1) // options.threads)
+    workers = max(1, min(concurrency or default_workers, len(pages)))
+    scale = options.scale
+
+    if not backend_available(options.backend):
+        print(f"⚠️  {_BACKEND_MODULES[options.backend]} 미설치: Tesseract로 전환")
+        options = replace(options, backend='tesseract')
+    if options.backend != 'tesseract':
+        # 모델을 시작할 때 로드해 설정 오류(한글 어휘 없는 docTR 모델 등)를 바로 알림
+        try:
+            _gpu_model(options)
+        except Exception as e:
+            print(f"❌ {options.backend} 모델 로드 실패, Tesseract로 전환: {e}")
+            options = replace(options, backend='tesseract')
+    if options.backend != 'tesseract':
+        options = replace(options, dtype=resolve_dtype(options.backend, options.dtype))
+        # GPU 모델은 한 프로세스에서 한 번 로드해 모든 페이지를 일괄 추론
+        if runner != 'batch':
+            print(f"⚠️  {options.backend} 백엔드는 배치 실행만 지원: batch로 전환")
+            runner = 'batch'
+    else:
+        if runner == 'async' and aiopytesseract is None:
+            print("⚠️  aiopytesseract 미설치: 프로세스 풀로 전환")
+            runner = 'process'
+        if runner in ('async', 'batch') and strategy.layout:
+            print(f"⚠️  {runner} 실행은 좌표 기반 추출을 지원하지 않음: 파이프라인으로 전환")
+            runner = 'pipeline'
+
+    backend = options.backend if options.backend == 'tesseract' else f"{options.backend} {options.dtype}"
+    print(f"⚙️  {runner} 실행 ({backend}, 워커 {workers}개 x Tesseract 스레드 {options.threads}, "
+          f"배율 {options.scale}x)")
+    print("-" * 60)
+
+    def run(page_nums: Sequence[int], scale: float, callback: PageCallback = None) -> List[PageData]:
+        nonlocal runner, options
+        if runner == 'batch':
+            try:
+                return run_batched(pdf_path, page_nums, strategy,
+                                   replace(options, scale=scale), workers, callback)
+            except Exception as e:
+                print(f"\n⚠️  배치 OCR 실패, Tesseract 페이지별 처리로 전환: {e}")
+                runner = 'process'
+                options = replace(options, backend='tesseract')
+        return _RUNNER_FUNCS[runner](pdf_path, page_nums, strategy,
+                                     replace(options, scale=scale), workers, callback)
+
+    def emit(data: PageData):
+        # 재시도할 페이지는 재시도 결과가 나올 때까지 보류
+        if scale >= RETRY_SCALE or recognized_candidates(data) >= MIN_RECOGNIZED:
+            on_page(data)
+
+    results = run(pages, scale, emit if on_page else None)
+
+    # 인식된 후보자가 적은 페이지만 높은 배율로 재시도
+    weak = [d.page_num - 1 for d in results if recognized_candidates(d) < MIN_RECOGNIZED]
+    if weak and scale < RETRY_SCALE:
+        print(f"\n🔁 인식 부족 {len(weak)}개 페이지 {RETRY_SCALE}x 재시도")
+        by_page = {d.page_num: d for d in results}
+        for retried in run(weak, RETRY_SCALE):
+            if recognized_candidates(retried) > recognized_candidates(by_page[retried.page_num]):
+                by_page[retried.page_num] = retried
+        results = [by_page[n] for n in sorted(by_page)]
+        if on_page:
+            for page_num in weak:
+                on_page(by_page[page_num + 1])
+
+    print(f"\n✅ 완료: {len(results)}개 페이지")
+    return results